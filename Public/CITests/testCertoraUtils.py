@@ -22,8 +22,9 @@ import sys
 import random
 import json5
 
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Dict, Callable, Any, List, Tuple, Type, Optional
+from typing import Dict, Callable, Any, List, Tuple, Type, Optional, ContextManager
 import jinja2
 
 scripts_dir_path = Path(__file__).parent.parent.resolve()  # one directory up
@@ -677,12 +678,14 @@ class TestSuite:
     def __init__(self, run_func: Callable, conf_file_template: str = '',
                  build_script_template: Optional[Path] = None,
                  test_attribute: Optional[Util.TestValue] = None,
-                 common_flags: List[str] = []):
+                 common_flags: List[str] = [],
+                 cwd: Optional[Path] = None):
         self.conf_file_template = conf_file_template  # path to the template conf file
         self.build_script_template = build_script_template  # path to the template build script
         self.test_attribute = test_attribute  # value for --test in case we want to stop before completion
         self.common_flags = common_flags  # flags common to all runs in the suite
         self.run_func = run_func
+        self.cwd = cwd  # directory the runs are made from, None for the current working directory
         self.supported_kwargs = ['description', 'expected', 'test_attribute', 'replacements', 'run_flags', 'build_script_context']
 
     def check_params(self, **kwargs: Any) -> None:
@@ -698,54 +701,63 @@ class TestSuite:
         if 'expected' not in kwargs:
             raise Util.ImplementationError(f"test missing expected: {kwargs}")
 
-        cmd_args = self.get_command_args(**kwargs)
-        try:
-            self.run_func(cmd_args)
-            raise InvalidResultException(f"succeeded, expected failure: {cmd_args}{Util.NEW_LINE}description: "
-                                         f"{kwargs['description']}")
-        except Util.TestResultsReady:
-            raise InvalidResultException(f"Expecting failure before checkpoint{cmd_args}{Util.NEW_LINE}"
-                                         f"when running: {cmd_args}{Util.NEW_LINE} "
-                                         f"description: {kwargs['description']}") from None
-
-        except Exception as e:
-            if kwargs['expected'] not in str(e):
-                raise InvalidResultException(f"when running: {cmd_args}{Util.NEW_LINE} "
-                                             f"description: {kwargs['description']}"
-                                             f"{Util.NEW_LINE}Expecting: {Util.NEW_LINE}\"{kwargs['expected']}\""
-                                             f"{Util.NEW_LINE}Got: {Util.NEW_LINE}\"{e}\"") from None
+        with self.working_directory():
+            cmd_args = self.get_command_args(**kwargs)
+            try:
+                self.run_func(cmd_args)
+                raise InvalidResultException(f"succeeded, expected failure: {cmd_args}{Util.NEW_LINE}description: "
+                                             f"{kwargs['description']}")
+            except Util.TestResultsReady:
+                raise InvalidResultException(f"Expecting failure before checkpoint{cmd_args}{Util.NEW_LINE}"
+                                             f"when running: {cmd_args}{Util.NEW_LINE} "
+                                             f"description: {kwargs['description']}") from None
+
+            except Exception as e:
+                if kwargs['expected'] not in str(e):
+                    raise InvalidResultException(f"when running: {cmd_args}{Util.NEW_LINE} "
+                                                 f"description: {kwargs['description']}"
+                                                 f"{Util.NEW_LINE}Expecting: {Util.NEW_LINE}\"{kwargs['expected']}\""
+                                                 f"{Util.NEW_LINE}Got: {Util.NEW_LINE}\"{e}\"") from None
 
     def expect_success(self, **kwargs: Any) -> None:
         self.check_params(**kwargs)
 
-        cmd_args = self.get_command_args(**kwargs)
-        try:
-            self.run_func(cmd_args)
-        except Util.TestResultsReady:
-            assert True
-        except Exception as e:
-            raise InvalidResultException(f"failed, expected success: {cmd_args}{Util.NEW_LINE}description: "
-                                         f"{kwargs['description']} "
-                                         f"{Util.NEW_LINE}Exception got:{e}") from None
+        with self.working_directory():
+            cmd_args = self.get_command_args(**kwargs)
+            try:
+                self.run_func(cmd_args)
+            except Util.TestResultsReady:
+                assert True
+            except Exception as e:
+                raise InvalidResultException(f"failed, expected success: {cmd_args}{Util.NEW_LINE}description: "
+                                             f"{kwargs['description']} "
+                                             f"{Util.NEW_LINE}Exception got:{e}") from None
 
     def expect_checkpoint(self, **kwargs: Any) -> Any:
         self.check_params(**kwargs)
 
-        cmd_args = self.get_command_args(**kwargs)
-        test_attribute = cmd_args[cmd_args.index("--test") + 1]  # get the checkpoint of the test
-        if '--test' not in cmd_args:
-            raise Util.ImplementationError(f"test missing test_attribute: {kwargs}")
-        try:
-            self.run_func(cmd_args)
-            raise AssertionError(f"Terminating before reaching checkpoint '{test_attribute}"
-                                 f"{Util.NEW_LINE}Description: {kwargs['description']}")
-
-        except Util.TestResultsReady as e:
-            return e.data
-        except Exception as e:
-            raise AssertionError(f"Exception before reaching checkpoint '{test_attribute}'"
-                                 f"{Util.NEW_LINE}Description: {kwargs['description']}"
-                                 f"{Util.NEW_LINE}Got:{str(e)}{Util.NEW_LINE}{Util.NEW_LINE}") from None
+        with self.working_directory():
+            cmd_args = self.get_command_args(**kwargs)
+            test_attribute = cmd_args[cmd_args.index("--test") + 1]  # get the checkpoint of the test
+            if '--test' not in cmd_args:
+                raise Util.ImplementationError(f"test missing test_attribute: {kwargs}")
+            try:
+                self.run_func(cmd_args)
+                raise AssertionError(f"Terminating before reaching checkpoint '{test_attribute}"
+                                     f"{Util.NEW_LINE}Description: {kwargs['description']}")
+
+            except Util.TestResultsReady as e:
+                return e.data
+            except Exception as e:
+                raise AssertionError(f"Exception before reaching checkpoint '{test_attribute}'"
+                                     f"{Util.NEW_LINE}Description: {kwargs['description']}"
+                                     f"{Util.NEW_LINE}Got:{str(e)}{Util.NEW_LINE}{Util.NEW_LINE}") from None
+
+    def working_directory(self) -> ContextManager[None]:
+        """
+        Runs of the suite are made from self.cwd, relative paths in the conf file are resolved against it
+        """
+        return Util.change_working_directory(self.cwd) if self.cwd else nullcontext()
 
     def conf_file_content(self) -> str:
         with open(self.conf_file_template, 'r') as file:
@@ -16,22 +16,24 @@
 #     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 
+import functools
 import os
 import sys
-import random
+import tempfile
 import unittest
 from pathlib import Path
-from typing import Set
+from typing import AbstractSet
 import zipfile
 
 
+_THIS_DIR = Path(__file__).resolve().parent
+
 # Add the path to the Test directory to the system path
-test_dir_path = Path(__file__).parent.parent.resolve()
+test_dir_path = _THIS_DIR.parent
 sys.path.insert(0, str(test_dir_path))
 
 # Add the path to the scripts directory to the system path
-scripts_dir_path = Path(__file__).parent.parent.parent / "scripts"
-scripts_dir_path = scripts_dir_path.resolve()
+scripts_dir_path = _THIS_DIR.parent.parent / "scripts"
 sys.path.insert(0, str(scripts_dir_path))
 
 TestEVM_path = ''
@@ -65,231 +67,146 @@ from CertoraProver.certoraContextClass import CertoraContext
 from Shared import certoraAttrUtil as AttrUtil
 
 # short call so we can put all args in a single line
+@functools.lru_cache(maxsize=None)
 def _p(filename: str) -> str:
     return TestUtil.path_test_file(filename)
 VAULT_CONF_DIR = f"{CITests_path}/test_data/certora-vault-tutorial/programs/vault/src/certora/confs"
+# the physical path, so paths the prover derives from the cwd can be compared against it
+VAULT_CONF_PATH = Path(VAULT_CONF_DIR).resolve()
 
 remote_args = ["--server", "staging", "--prover_version", "master"]
 
-def assert_context(context: CertoraContext, test_id: str) -> None:
-    got = context.solana_inlining
-    expected = ['../envs/cvlr_inlining.txt']
-    assert got == expected, f"{test_id} solana_inlining: {got}, expected {expected}"
 
-    got = context.solana_summaries
-    expected = ['../envs/cvlr_summaries.txt']
-    assert got == expected, f"{test_id} solana_summaries: {got}, expected {expected}"
+def _vault_suite(conf_file_template: str) -> TestUtil.SolanaProverTestSuite:
+    """
+    A suite for a vault conf. The checkpoint is passed per call via test_attribute.
+    Runs are made from VAULT_CONF_PATH, so returned relative paths are relative to it
+    """
+    return TestUtil.SolanaProverTestSuite(conf_file_template=conf_file_template, cwd=VAULT_CONF_PATH)
 
-    got = len(context.files)
-    expected = 1
-    assert got == expected, f"{test_id} files len: {got}, expected: {expected}"
+def assert_context(context: CertoraContext, test_id: str) -> None:
+    got = (context.solana_inlining, context.solana_summaries, len(context.files))
+    expected = (['../envs/cvlr_inlining.txt'], ['../envs/cvlr_summaries.txt'], 1)
+    assert got == expected, f"{test_id} (solana_inlining, solana_summaries, files len): {got}, expected {expected}"
 
-    got = os.path.relpath(context.files[0], os.getcwd())
+    got = os.path.relpath((VAULT_CONF_PATH / context.files[0]).resolve(), VAULT_CONF_PATH)
     expected = '../../../../../target/sbf-solana-solana/release/certora_vault.so'
     assert got == expected, f"{test_id} files: {got}, expected: {expected}"
 
+JAR_CMD_EXPECTED_SUB_STRINGS = (
+    'emv.jar ../../../../../target/sbf-solana-solana/release/certora_vault.so',
+    '-solanaSummaries ../envs/cvlr_summaries.txt',
+    '-solanaInlining ../envs/cvlr_inlining.txt'
+)
+
 def assert_jar_cmd(jar_cmd: str, test_id: str) -> None:
-    expected_sub_strings = [
-        'emv.jar ../../../../../target/sbf-solana-solana/release/certora_vault.so',
-        '-solanaSummaries ../envs/cvlr_summaries.txt',
-        '-solanaInlining ../envs/cvlr_inlining.txt'
-    ]
-    for expected_sub_string in expected_sub_strings:
-        assert expected_sub_string in jar_cmd, f"{test_id} jar_cmd: {jar_cmd}, expected to contain: {expected_sub_string}"
+    missing = [sub_string for sub_string in JAR_CMD_EXPECTED_SUB_STRINGS if sub_string not in jar_cmd]
+    assert not missing, f"{test_id} jar_cmd: {jar_cmd}, expected to contain: {missing}"
+
 
+_SOURCES = '.certora_sources'
+_VAULT_SRC = f'{_SOURCES}/programs/vault/src'
+_VAULT_CERTORA = f'{_VAULT_SRC}/certora'
+_VAULT_CONFS = f'{_VAULT_CERTORA}/confs'
 
-common_expected_files_set = {
+common_expected_files_set = frozenset({
     'certora_debug_log.txt',
     '.certora_metadata.json',
     '.configuration_layout.json',
     'certora_vault.so',
-    '.certora_sources/run.conf',
-    '.certora_sources/programs/vault/src/certora/envs/cvlr_inlining.txt',
-    '.certora_sources/programs/vault/src/certora/envs/cvlr_summaries.txt',
-    '.certora_sources/target/sbf-solana-solana/release/certora_vault.so',
-    '.certora_sources/programs/vault/src/certora/confs/.cwd'
+    f'{_SOURCES}/run.conf',
+    f'{_VAULT_CERTORA}/envs/cvlr_inlining.txt',
+    f'{_VAULT_CERTORA}/envs/cvlr_summaries.txt',
+    f'{_SOURCES}/target/sbf-solana-solana/release/certora_vault.so',
+    f'{_VAULT_CONFS}/.cwd'
+})
+
+common_build_files_set = frozenset(
+    {f'{_VAULT_SRC}/{f}' for f in (
+        'processor.rs', 'loaders.rs', 'lib.rs', 'state.rs', 'errors.rs', 'instruction.rs', 'operations.rs',
+        'utils/guards.rs', 'utils/mod.rs', 'utils/math.rs'
+    )} |
+    {f'{_VAULT_CERTORA}/{f}' for f in (
+        'constants.rs', 'log.rs', 'mod.rs', 'nondet.rs', 'utils.rs', 'mocks/processor.rs', 'mocks/mod.rs'
+    )} |
+    {f'{_VAULT_CERTORA}/specs/{f}' for f in (
+        'solvency_processor.rs', 'no_dilution.rs', 'props_processor.rs', 'fees.rs', 'vault_consistency.rs',
+        'base.rs', 'mod.rs', 'solvency.rs', 'props.rs', 'access_control.rs', 'no_dilution_processor.rs',
+        'base_processor.rs'
+    )} |
+    {f'{_SOURCES}/.project_directory'}
+)
+
+EXPECTED_FILES_CARGO = common_expected_files_set | common_build_files_set | {f'{_VAULT_CONFS}/conf_cargo.conf'}
+
+EXPECTED_FILES_SCRIPT = common_expected_files_set | common_build_files_set | {
+    f'{_VAULT_CONFS}/conf_script.conf',
+    f'{_SOURCES}/programs/vault/certora_build.py'
 }
 
-common_build_files_set = {
-    '.certora_sources/programs/vault/src/processor.rs',
-    '.certora_sources/programs/vault/src/loaders.rs',
-    '.certora_sources/programs/vault/src/lib.rs',
-    '.certora_sources/programs/vault/src/state.rs',
-    '.certora_sources/programs/vault/src/errors.rs',
-    '.certora_sources/programs/vault/src/instruction.rs',
-    '.certora_sources/programs/vault/src/operations.rs',
-    '.certora_sources/programs/vault/src/utils/guards.rs',
-    '.certora_sources/programs/vault/src/utils/mod.rs',
-    '.certora_sources/programs/vault/src/utils/math.rs',
-    '.certora_sources/programs/vault/src/certora/constants.rs',
-    '.certora_sources/programs/vault/src/certora/log.rs',
-    '.certora_sources/programs/vault/src/certora/mod.rs',
-    '.certora_sources/programs/vault/src/certora/nondet.rs',
-    '.certora_sources/programs/vault/src/certora/utils.rs',
-    '.certora_sources/programs/vault/src/certora/mocks/processor.rs',
-    '.certora_sources/programs/vault/src/certora/mocks/mod.rs',
-    '.certora_sources/programs/vault/src/certora/specs/solvency_processor.rs',
-    '.certora_sources/programs/vault/src/certora/specs/no_dilution.rs',
-    '.certora_sources/programs/vault/src/certora/specs/props_processor.rs',
-    '.certora_sources/programs/vault/src/certora/specs/fees.rs',
-    '.certora_sources/programs/vault/src/certora/specs/vault_consistency.rs',
-    '.certora_sources/programs/vault/src/certora/specs/base.rs',
-    '.certora_sources/programs/vault/src/certora/specs/mod.rs',
-    '.certora_sources/programs/vault/src/certora/specs/solvency.rs',
-    '.certora_sources/programs/vault/src/certora/specs/props.rs',
-    '.certora_sources/programs/vault/src/certora/specs/access_control.rs',
-    '.certora_sources/programs/vault/src/certora/specs/no_dilution_processor.rs',
-    '.certora_sources/programs/vault/src/certora/specs/base_processor.rs',
-    '.certora_sources/.project_directory'
-}
+EXPECTED_FILES_NO_BUILD = common_expected_files_set | {f'{_VAULT_CONFS}/conf_no_build.conf'}
 
+# (conf file, description suffix, test id prefix, expected zip contents) for each way of running the vault.
+# The variants run sequentially: each run chdirs process-wide into VAULT_CONF_PATH (TestSuite.working_directory),
+# .certora_internal is resolved relative to the cwd, and the prover keeps global state between runs
+VAULT_VARIANTS = [
+    ("conf_cargo.conf", "from cargo", "cargo", EXPECTED_FILES_CARGO),
+    ("conf_script.conf", "from script", "script", EXPECTED_FILES_SCRIPT),
+    ("conf_no_build.conf", "without build", "no build", EXPECTED_FILES_NO_BUILD),
+]
 
-def assert_zip_file(zip_path: str, test_id: str, expected_files_set: Set[str]) -> None:
-    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        zip_contents_set = set(zip_ref.namelist())
 
-    diff = zip_contents_set - expected_files_set
-    assert not diff, f"test_solana_zip: {test_id} zip contains unexpected files: {diff}"
-    diff = expected_files_set - zip_contents_set
-    assert not diff, f"test_solana_zip: {test_id} zip is missing expected files: {diff}"
+def assert_zip_file(zip_path: Path, test_id: str, expected_files_set: AbstractSet[str],
+                    max_listed: int = 10) -> None:
+    with zipfile.ZipFile(zip_path, mode='r', allowZip64=True) as zip_ref:
+        actual = frozenset(info.filename for info in zip_ref.infolist())
+    if actual == expected_files_set:
+        return
+
+    unexpected = sorted(actual - expected_files_set)
+    missing = sorted(expected_files_set - actual)
+    raise AssertionError(f"test_solana_zip: {test_id} zip contains {len(unexpected)} unexpected files: "
+                         f"{unexpected[:max_listed]}, and is missing {len(missing)} expected files: "
+                         f"{missing[:max_listed]}")
 
 
 class TestClient(unittest.TestCase):
 
     def test_solana_context(self) -> None:
-        with Util.change_working_directory(VAULT_CONF_DIR):
-
-            # solana run from cargo
-            suite = TestUtil.SolanaProverTestSuite(
-                conf_file_template="conf_cargo.conf",
-                test_attribute=str(Util.TestValue.AFTER_BUILD)
-            )
-
-            context = suite.expect_checkpoint(description="solana context: locally from cargo")
-            assert_context(context, "cargo local")
-            context = suite.expect_checkpoint(description="solana context: remotely from cargo", run_flags=remote_args)
-            assert_context(context, "cargo remote")
-
-            # solana run from a build script
-            suite = TestUtil.SolanaProverTestSuite(
-                conf_file_template="conf_script.conf",
-                test_attribute=str(Util.TestValue.AFTER_BUILD)
-            )
-
-            context = suite.expect_checkpoint(description="solana context: locally from script")
-            assert_context(context, "script local")
-            context = suite.expect_checkpoint(description="solana context: remotely from script", run_flags=remote_args)
-            assert_context(context, "script remote")
-
-            # solana run no build
-            suite = TestUtil.SolanaProverTestSuite(
-                conf_file_template="conf_no_build.conf",
-                test_attribute=str(Util.TestValue.AFTER_BUILD)
-            )
-
-            context = suite.expect_checkpoint(description="solana context: locally without build")
-            assert_context(context, "no build local")
-            context = suite.expect_checkpoint(description="solana context: remotely without build",
-                                              run_flags=remote_args)
-            assert_context(context, "no build remote")
+        for conf_file_template, how, tag, _ in VAULT_VARIANTS:
+            with self.subTest(variant=tag):
+                suite = _vault_suite(conf_file_template)
+
+                context = suite.expect_checkpoint(description=f"solana context: locally {how}",
+                                                  test_attribute=Util.TestValue.AFTER_BUILD)
+                assert_context(context, f"{tag} local")
+                context = suite.expect_checkpoint(description=f"solana context: remotely {how}",
+                                                  test_attribute=Util.TestValue.AFTER_BUILD,
+                                                  run_flags=remote_args)
+                assert_context(context, f"{tag} remote")
 
     def test_solana_jar_cmd(self) -> None:
-
-        with Util.change_working_directory(VAULT_CONF_DIR):
-
-            # solana run from cargo
-            suite = TestUtil.SolanaProverTestSuite(
-                conf_file_template="conf_cargo.conf",
-                test_attribute=str(Util.TestValue.BEFORE_LOCAL_PROVER_CALL)
-            )
-
-            jar_cmd = suite.expect_checkpoint(description="solana jar: locally from cargo")
-            assert_jar_cmd(jar_cmd, "cargo local")
-
-            # solana run from a build script
-            suite = TestUtil.SolanaProverTestSuite(
-                conf_file_template="conf_script.conf",
-                test_attribute=str(Util.TestValue.BEFORE_LOCAL_PROVER_CALL)
-            )
-
-            jar_cmd = suite.expect_checkpoint(description="solana jar: locally from script")
-            assert_jar_cmd(jar_cmd, "script local")
-
-            # solana run no build
-            suite = TestUtil.SolanaProverTestSuite(
-                conf_file_template="conf_no_build.conf",
-                test_attribute=str(Util.TestValue.BEFORE_LOCAL_PROVER_CALL)
-            )
-
-            jar_cmd = suite.expect_checkpoint(description="solana jar: locally without build")
-            assert_jar_cmd(jar_cmd, "no build local")
+        for conf_file_template, how, tag, _ in VAULT_VARIANTS:
+            with self.subTest(variant=tag):
+                jar_cmd = _vault_suite(conf_file_template).expect_checkpoint(
+                    description=f"solana jar: locally {how}",
+                    test_attribute=Util.TestValue.BEFORE_LOCAL_PROVER_CALL)
+                assert_jar_cmd(jar_cmd, f"{tag} local")
 
     def test_solana_zip(self) -> None:
-
-        with Util.change_working_directory(VAULT_CONF_DIR):
-
-            conf_file_template = "conf_cargo.conf"
-            expected_files_set = common_expected_files_set.union(
-                {f'.certora_sources/programs/vault/src/certora/confs/{conf_file_template}'},
-                common_build_files_set
-            )
-
-            # solana run from cargo
-            suite = TestUtil.SolanaProverTestSuite(
-                conf_file_template="conf_cargo.conf",
-                test_attribute=str(Util.TestValue.CHECK_ZIP)
-            )
-
-            zip_path = suite.expect_checkpoint(description="solana jar: locally from cargo", run_flags=remote_args)
-            assert_zip_file(zip_path, "cargo local", expected_files_set)
-
-            # solana run from a build script
-
-            conf_file_template = "conf_script.conf"
-            expected_files_set = common_expected_files_set.union(
-                {
-                    f'.certora_sources/programs/vault/src/certora/confs/{conf_file_template}',
-                    '.certora_sources/programs/vault/certora_build.py'
-                },
-                common_build_files_set
-            )
-            suite = TestUtil.SolanaProverTestSuite(
-                conf_file_template="conf_script.conf",
-                test_attribute=str(Util.TestValue.CHECK_ZIP)
-            )
-
-            zip_path = suite.expect_checkpoint(description="solana jar: locally from script", run_flags=remote_args)
-            assert_zip_file(zip_path,  "script local", expected_files_set)
-
-            # solana run no build
-
-            conf_file_template = "conf_no_build.conf"
-            expected_files_set = common_expected_files_set.union({
-                f'.certora_sources/programs/vault/src/certora/confs/{conf_file_template}'
-            })
-
-            suite = TestUtil.SolanaProverTestSuite(
-                conf_file_template=conf_file_template,
-                test_attribute=str(Util.TestValue.CHECK_ZIP)
-            )
-
-            zip_path = suite.expect_checkpoint(description="solana jar: locally without build", run_flags=remote_args)
-            assert_zip_file(zip_path, "no build local", expected_files_set)
-
-    @staticmethod
-    def get_card_object(parent, nested):
-        return next((section for section in parent if section.card_title == nested), None)
-
-    @staticmethod
-    def get_inner_object(parent, nested):
-        return next((section for section in parent if section.inner_title == nested), None)
-
+        for conf_file_template, how, tag, expected_files_set in VAULT_VARIANTS:
+            with self.subTest(variant=tag):
+                zip_path = _vault_suite(conf_file_template).expect_checkpoint(
+                    description=f"solana jar: locally {how}", test_attribute=Util.TestValue.CHECK_ZIP,
+                    run_flags=remote_args)
+                assert_zip_file(VAULT_CONF_PATH / zip_path, f"{tag} local", expected_files_set)
 
     def test_solana_runs(self) -> None:
 
-        temp_dir = f"temp_{random.randint(0, 99999):05d}"
-
-        os.makedirs(temp_dir, exist_ok=True)
+        # the project directory must be a subdirectory of the cwd, so we keep the temp dir here and use its name
+        tmp = tempfile.TemporaryDirectory(prefix="solana_test_", dir=Path.cwd())
+        self.addCleanup(tmp.cleanup)
+        temp_dir = Path(tmp.name).name
 
         suite = TestUtil.SolanaProverTestSuite(
             conf_file_template=str(Path.cwd() / _p("rust.conf")),
@@ -381,9 +298,10 @@ class TestClient(unittest.TestCase):
             raise AssertionError(f"__test_main_spec: No Test Result for {args}")
         except Util.TestResultsReady as e:
             layout = e.data.configuration_layout
+            cards = {section.card_title: section for section in layout}
 
             # Validating files section in RunConfigurationLayout
-            files = self.get_card_object(layout, 'files')
+            files = cards.get('files')
             assert files, f"Error! files section is expected to exist in configuration layout data!\n{layout}"
             assert _p('empty.so') in files.content[0].content, \
                 f"Error! files in configuration layout is {files.content[0].content}, expected {_p('empty.so')}"
@@ -393,20 +311,21 @@ class TestClient(unittest.TestCase):
 
             # Validating general section exists in RunConfigurationLayout
             # Note: we do not have Git or CLI version info on CI
-            assert self.get_card_object(layout, 'general'), \
+            assert cards.get('general'), \
                    f"Error! General section is expected to exist in configuration layout data!\n{layout}"
 
             # Validating options section
-            options_data = self.get_card_object(layout, 'options')
+            options_data = cards.get('options')
             assert options_data, \
                 f"Error! Options section is expected to exist in configuration layout data!\n{layout}"
+            options = {section.inner_title: section for section in options_data.content}
 
-            server_data = self.get_inner_object(options_data.content, 'server')
+            server_data = options.get('server')
             assert server_data and "production" == server_data.content, \
                 f"Error! server flag in general section is incorrect!\n" \
                 f"expected: 'production', actual: '{server_data.content}'"
 
-            rule_data = self.get_inner_object(options_data.content, 'rule')
+            rule_data = options.get('rule')
             assert rule_data and "dummy_rule" in rule_data.content and "SIMPLE" == rule_data.content_type \
                    and "prover/cli" in rule_data.doc_link, \
                    f"Error! rule subsection in general section is incorrect!\n" \